@@ -597,6 +597,8 @@ class AnomalyAgent:
         yield {"type": "step", "step": "🤖 Generating AI analysis with Groq..."}
         
         ai_summaries = {"missing": None, "spike": None}
+        # Set when a summary falls back to the template because the LLM call failed or didn't parse
+        ai_fallback = False
         
         # Missing summary
         if not missing_table.empty:
@@ -617,6 +619,7 @@ class AnomalyAgent:
                     pass
             
             if not ai_summaries["missing"]:
+                ai_fallback = True
                 ai_summaries["missing"] = {
                     "summary": f"Missing Floodlight delivery detected across {missing_table['Floodlight Activity Name'].nunique()} activities.",
                     "likely_root_cause": "Common causes: GTM tag not firing, consent/CMP blocking, or container changes.",
@@ -650,6 +653,7 @@ class AnomalyAgent:
                     pass
             
             if not ai_summaries["spike"]:
+                ai_fallback = True
                 ai_summaries["spike"] = {
                     "summary": f"Spike behavior detected on {pd.Series(spike_table['Date']).nunique()} day(s).",
                     "likely_root_cause": "Likely traffic mix anomaly (spam/bots), attribution change, or campaign surge.",
@@ -681,6 +685,7 @@ class AnomalyAgent:
                 "channel_totals": channel_totals,
                 "overall_summary": overall_summary,
                 "ai_summaries": ai_summaries,
+                "ai_fallback": ai_fallback,
                 "missing_events_total": int(len(missing_adv)),
             }
         }
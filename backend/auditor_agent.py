@@ -14,6 +14,7 @@ This agent checks the GA4 Audit Doc tribal knowledge:
 """
 import re
 import pandas as pd
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Generator
@@ -28,6 +29,8 @@ class AuditorAgent:
             data_dir = Path(__file__).parent.parent / "data"
         self.data_dir = Path(data_dir)
         self.findings = []
+        self.finding_counts = Counter()
+        self.retain_findings = True
         self.reasoning_steps = []
         
         # Compiled regex patterns for efficiency
@@ -55,14 +58,24 @@ class AuditorAgent:
         self.reasoning_steps.append(log_entry)
         return log_entry
     
-    def run_audit(self, limit: int = None, min_batch_size: int = 20, max_batch_size: int = 30) -> Generator[dict, None, None]:
+    def _record_finding(self, finding: dict) -> dict:
+        """Count a finding (keeping it only if retained) and wrap it as an event."""
+        self.finding_counts[finding['priority']] += 1
+        if self.retain_findings:
+            self.findings.append(finding)
+        return {"type": "finding", "data": finding}
+    
+    def run_audit(self, limit: int = None, min_batch_size: int = 20, max_batch_size: int = 30, retain: bool = True) -> Generator[dict, None, None]:
         """
         Run the full governance audit in dynamic batches.
         Yields findings as they are discovered.
         Batch size is randomized (min-max).
+        With retain=False findings are only counted, not kept for get_summary().
         """
         import random
         self.findings = []
+        self.finding_counts = Counter()
+        self.retain_findings = retain
         self.reasoning_steps = []
         data = self._load_data()
         
@@ -125,7 +138,7 @@ class AuditorAgent:
             current_idx = end_idx
             batch_count += 1
             
-        yield self._log_step(f"✅ Auditor Agent completed. Found {len(self.findings)} governance issues.")
+        yield self._log_step(f"✅ Auditor Agent completed. Found {sum(self.finding_counts.values())} governance issues.")
     
     def _check_pii_in_urls(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check for PII (email, phone) in URL parameters - GDPR violation."""
@@ -153,8 +166,7 @@ class AuditorAgent:
                     ],
                     "recommendation": "Remove email parameter from URLs or hash (SHA256) before sending to GA4"
                 }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                yield self._record_finding(finding)
     
     def _check_data_retention(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if data retention is set to 14 months (not 2)."""
@@ -179,8 +191,7 @@ class AuditorAgent:
                 ],
                 "recommendation": "Update data retention to 14 months in GA4 Admin > Data Settings > Data Retention"
             }
-            self.findings.append(finding)
-            yield {"type": "finding", "data": finding}
+            yield self._record_finding(finding)
     
     def _check_google_signals(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if Google Signals is enabled for cross-device reporting."""
@@ -206,8 +217,7 @@ class AuditorAgent:
                 ],
                 "recommendation": "Enable Google Signals in GA4 Admin > Data Settings > Data Collection"
             }
-            self.findings.append(finding)
-            yield {"type": "finding", "data": finding}
+            yield self._record_finding(finding)
     
     def _check_enhanced_measurement(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if Enhanced Measurement has all recommended features enabled."""
@@ -241,8 +251,7 @@ class AuditorAgent:
                     ],
                     "recommendation": f"Enable missing features in GA4 Admin > Data Streams > Enhanced Measurement"
                 }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                yield self._record_finding(finding)
                 break  # Only report once per property
     
     def _check_campaign_naming(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
@@ -282,8 +291,7 @@ class AuditorAgent:
                     if has_uppercase:
                         finding['issues_found'].append("Contains uppercase letters")
                     
-                    self.findings.append(finding)
-                    yield {"type": "finding", "data": finding}
+                    yield self._record_finding(finding)
     
     def _check_referral_exclusions(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if payment gateways are in referral exclusion list."""
@@ -325,8 +333,7 @@ class AuditorAgent:
                     ],
                     "recommendation": "Add payment gateway domains to Referral Exclusions in GA4 Admin"
                 }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                yield self._record_finding(finding)
     
     def _check_consent_mode(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check Consent Mode configuration status."""
@@ -359,8 +366,7 @@ class AuditorAgent:
                     ],
                     "recommendation": "Implement Consent Mode v2 with your CMP (Consent Management Platform)"
                 }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                yield self._record_finding(finding)
     
     def _check_cost_data_import(self, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if Cost Data Import is enabled for Meta/TikTok."""
@@ -393,19 +399,18 @@ class AuditorAgent:
                     ],
                     "recommendation": "Enable Cost Data Import for Meta and TikTok in GA4 Admin > Data Import"
                 }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                yield self._record_finding(finding)
                 break  # Only report once
     
     def get_summary(self) -> dict:
         """Get a summary of all findings."""
-        p0_count = len([f for f in self.findings if f['priority'] == 'P0'])
-        p1_count = len([f for f in self.findings if f['priority'] == 'P1'])
-        p2_count = len([f for f in self.findings if f['priority'] == 'P2'])
+        p0_count = self.finding_counts['P0']
+        p1_count = self.finding_counts['P1']
+        p2_count = self.finding_counts['P2']
         
         return {
             "agent": "Auditor",
-            "total_findings": len(self.findings),
+            "total_findings": sum(self.finding_counts.values()),
             "p0_critical": p0_count,
             "p1_high": p1_count,
             "p2_medium": p2_count,
@@ -38,13 +38,23 @@ def get_secret(key: str, default: str = None) -> str:
     return os.getenv(key, default)
 
 
+# Groq / google-genai clients by API key. Only successful inits are kept, so a failed
+# one is retried by the next agent; google.generativeai is configured through
+# module-global state, so it is never cached per key
+_genai_clients = {}
+
+
 def get_genai_client(api_key: str):
-    """Lazy load the AI client (Groq or Gemini)."""
+    """Lazy load the AI client (Groq or Gemini); Groq and google-genai clients are shared per API key."""
+    cached = _genai_clients.get(api_key)
+    if cached:
+        return cached
     # Try Groq first if available
     if api_key.startswith("gsk_"):
         try:
             from groq import Groq
-            return Groq(api_key=api_key), "groq"
+            _genai_clients[api_key] = Groq(api_key=api_key), "groq"
+            return _genai_clients[api_key]
         except ImportError:
             print("❌ Groq library not installed. Run `pip install groq`.")
         except Exception as e:
@@ -63,7 +73,8 @@ def get_genai_client(api_key: str):
     # Try new package (google-genai)
     try:
         from google import genai
-        return genai.Client(api_key=api_key), True
+        _genai_clients[api_key] = genai.Client(api_key=api_key), True
+        return _genai_clients[api_key]
     except ImportError:
         pass
     except Exception as e:
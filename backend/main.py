@@ -6,16 +6,36 @@ Endpoints:
 - POST /audit/run - Run full audit (streaming)
 - GET /audit/health - Health check
 - POST /audit/quick - Quick audit (limited records)
+- WS   /audit/ws - Full audit pushed over a WebSocket
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import Optional, List
 import json
 import asyncio
+from collections import Counter
 from datetime import datetime
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        """Serialize an event payload (orjson when installed)."""
+        # Agent payloads carry numpy scalars read from pandas rows
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:
+    def _numpy_default(obj):
+        """json.dumps fallback for numpy scalars (np.int64 is not an int subclass)."""
+        if hasattr(obj, "item"):
+            return obj.item()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps(obj) -> str:
+        """Serialize an event payload (orjson when installed)."""
+        return json.dumps(obj, default=_numpy_default)
+
 from technician_agent import TechnicianAgent
 from auditor_agent import AuditorAgent
 from cfo_agent import CFOAgent
@@ -80,8 +100,43 @@ async def health_check():
     }
 
 
-async def stream_audit_events(limit: Optional[int] = None, include_cfo: bool = True):
-    """Generator that streams audit events as SSE."""
+async def _relay_events(agent_name: str, events, all_findings: list, all_reasoning: list, cfo_reports: Optional[list] = None):
+    """Relay one agent's events as API events, collecting findings, reasoning steps and CFO reports."""
+    events = iter(events)
+    while True:
+        # Agents block between batches; advance them off the event loop
+        event = await asyncio.to_thread(next, events, None)
+        if event is None:
+            break
+        event_type = event.get("type")
+        if event_type == "finding":
+            all_findings.append(event["data"])
+            yield {'type': 'finding', 'agent': agent_name, 'data': event['data']}
+        elif event_type == "cfo_report" and cfo_reports is not None:
+            cfo_reports.append(event["data"])
+            yield {'type': 'cfo_report', 'data': event['data']}
+        else:
+            all_reasoning.append(event)
+            yield {'type': 'step', 'agent': agent_name, 'step': event.get('step', '')}
+        await asyncio.sleep(0.05)  # Small delay for streaming effect
+
+
+def _collect_events(events, all_findings: list, all_reasoning: list) -> Optional[dict]:
+    """Drain one agent's events into the shared lists; returns the CFO report, if any."""
+    cfo_report = None
+    for event in events:
+        event_type = event.get("type")
+        if event_type == "finding":
+            all_findings.append(event["data"])
+        elif event_type == "cfo_report":
+            cfo_report = event["data"]
+        else:
+            all_reasoning.append(event)
+    return cfo_report
+
+
+async def audit_events(limit: Optional[int] = None, include_cfo: bool = True):
+    """Generator that streams audit events as dicts; each transport does its own framing."""
     all_findings = []
     all_reasoning = []
     
@@ -91,60 +146,45 @@ async def stream_audit_events(limit: Optional[int] = None, include_cfo: bool = T
     cfo = CFOAgent()
     
     # Stream Technician Agent events
-    yield f"data: {json.dumps({'type': 'agent_start', 'agent': 'Technician', 'message': 'Starting Technician Agent...'})}\n\n"
+    yield {'type': 'agent_start', 'agent': 'Technician', 'message': 'Starting Technician Agent...'}
     await asyncio.sleep(0.1)
     
-    for event in technician.run_audit(limit=limit):
-        if event.get("type") == "finding":
-            all_findings.append(event["data"])
-            yield f"data: {json.dumps({'type': 'finding', 'agent': 'Technician', 'data': event['data']})}\n\n"
-        else:
-            all_reasoning.append(event)
-            yield f"data: {json.dumps({'type': 'step', 'agent': 'Technician', 'step': event.get('step', '')})}\n\n"
-        await asyncio.sleep(0.05)  # Small delay for streaming effect
+    async for event in _relay_events('Technician', technician.run_audit(limit=limit, retain=False), all_findings, all_reasoning):
+        yield event
     
     technician_summary = technician.get_summary()
-    yield f"data: {json.dumps({'type': 'agent_complete', 'agent': 'Technician', 'summary': {'findings': technician_summary['total_findings']}})}\n\n"
+    yield {'type': 'agent_complete', 'agent': 'Technician', 'summary': {'findings': technician_summary['total_findings']}}
     await asyncio.sleep(0.2)
     
     # Stream Auditor Agent events
-    yield f"data: {json.dumps({'type': 'agent_start', 'agent': 'Auditor', 'message': 'Starting Auditor Agent...'})}\n\n"
+    yield {'type': 'agent_start', 'agent': 'Auditor', 'message': 'Starting Auditor Agent...'}
     await asyncio.sleep(0.1)
     
-    for event in auditor.run_audit(limit=limit):
-        if event.get("type") == "finding":
-            all_findings.append(event["data"])
-            yield f"data: {json.dumps({'type': 'finding', 'agent': 'Auditor', 'data': event['data']})}\n\n"
-        else:
-            all_reasoning.append(event)
-            yield f"data: {json.dumps({'type': 'step', 'agent': 'Auditor', 'step': event.get('step', '')})}\n\n"
-        await asyncio.sleep(0.05)
+    async for event in _relay_events('Auditor', auditor.run_audit(limit=limit, retain=False), all_findings, all_reasoning):
+        yield event
     
     auditor_summary = auditor.get_summary()
-    yield f"data: {json.dumps({'type': 'agent_complete', 'agent': 'Auditor', 'summary': {'findings': auditor_summary['total_findings']}})}\n\n"
+    yield {'type': 'agent_complete', 'agent': 'Auditor', 'summary': {'findings': auditor_summary['total_findings']}}
     await asyncio.sleep(0.2)
     
     # Stream CFO Agent events
+    cfo_report = None
     if include_cfo:
-        yield f"data: {json.dumps({'type': 'agent_start', 'agent': 'CFO', 'message': 'Starting CFO Agent...'})}\n\n"
+        yield {'type': 'agent_start', 'agent': 'CFO', 'message': 'Starting CFO Agent...'}
         await asyncio.sleep(0.1)
         
-        cfo_report = None
-        for event in cfo.analyze(all_findings):
-            if event.get("type") == "cfo_report":
-                cfo_report = event["data"]
-                yield f"data: {json.dumps({'type': 'cfo_report', 'data': cfo_report})}\n\n"
-            else:
-                all_reasoning.append(event)
-                yield f"data: {json.dumps({'type': 'step', 'agent': 'CFO', 'step': event.get('step', '')})}\n\n"
-            await asyncio.sleep(0.05)
+        cfo_reports = []
+        async for event in _relay_events('CFO', cfo.analyze(all_findings), all_findings, all_reasoning, cfo_reports):
+            yield event
+        cfo_report = cfo_reports[-1] if cfo_reports else None
         
-        yield f"data: {json.dumps({'type': 'agent_complete', 'agent': 'CFO', 'summary': {'health_score': cfo_report['health_score'] if cfo_report else 0}})}\n\n"
+        yield {'type': 'agent_complete', 'agent': 'CFO', 'summary': {'health_score': cfo_report['health_score'] if cfo_report else 0}}
     
     # Final summary
-    p0_count = len([f for f in all_findings if f.get('priority') == 'P0'])
-    p1_count = len([f for f in all_findings if f.get('priority') == 'P1'])
-    p2_count = len([f for f in all_findings if f.get('priority') == 'P2'])
+    priority_counts = Counter(f.get('priority') for f in all_findings)
+    p0_count = priority_counts['P0']
+    p1_count = priority_counts['P1']
+    p2_count = priority_counts['P2']
     
     final_summary = {
         "type": "audit_complete",
@@ -154,7 +194,13 @@ async def stream_audit_events(limit: Optional[int] = None, include_cfo: bool = T
         "p2_medium": p2_count,
         "health_score": cfo_report['health_score'] if cfo_report else 100 - (p0_count * 10 + p1_count * 5 + p2_count * 2)
     }
-    yield f"data: {json.dumps(final_summary)}\n\n"
+    yield final_summary
+
+
+async def stream_audit_events(limit: Optional[int] = None, include_cfo: bool = True):
+    """Generator that streams audit events as SSE."""
+    async for event in audit_events(limit, include_cfo):
+        yield f"data: {_dumps(event)}\n\n"
 
 
 @app.post("/audit/stream")
@@ -169,6 +215,28 @@ async def run_audit_stream(request: AuditRequest):
     )
 
 
+@app.websocket("/audit/ws")
+async def run_audit_ws(websocket: WebSocket):
+    """
+    Run full audit over a WebSocket.
+    Send an AuditRequest as JSON; each event comes back as one text message.
+    """
+    await websocket.accept()
+    try:
+        try:
+            request = AuditRequest(**await websocket.receive_json())
+        except (ValueError, TypeError, KeyError, ValidationError) as e:
+            # Malformed JSON, a binary frame (no "text" key) or a payload that doesn't fit AuditRequest
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+            return
+        async for event in audit_events(request.limit, request.include_cfo_narrative):
+            await websocket.send_text(_dumps(event))
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
+
+
 @app.post("/audit/run", response_model=AuditResponse)
 async def run_audit(request: AuditRequest):
     """
@@ -180,34 +248,23 @@ async def run_audit(request: AuditRequest):
     
     # Run Technician Agent
     technician = TechnicianAgent()
-    for event in technician.run_audit(limit=request.limit):
-        if event.get("type") == "finding":
-            all_findings.append(event["data"])
-        else:
-            all_reasoning.append(event)
+    await asyncio.to_thread(_collect_events, technician.run_audit(limit=request.limit, retain=False), all_findings, all_reasoning)
     
     # Run Auditor Agent
     auditor = AuditorAgent()
-    for event in auditor.run_audit(limit=request.limit):
-        if event.get("type") == "finding":
-            all_findings.append(event["data"])
-        else:
-            all_reasoning.append(event)
+    await asyncio.to_thread(_collect_events, auditor.run_audit(limit=request.limit, retain=False), all_findings, all_reasoning)
     
     # Run CFO Agent
     cfo_report = None
     if request.include_cfo_narrative:
         cfo = CFOAgent()
-        for event in cfo.analyze(all_findings):
-            if event.get("type") == "cfo_report":
-                cfo_report = event["data"]
-            else:
-                all_reasoning.append(event)
+        cfo_report = await asyncio.to_thread(_collect_events, cfo.analyze(all_findings), all_findings, all_reasoning)
     
     # Build response
-    p0_count = len([f for f in all_findings if f.get('priority') == 'P0'])
-    p1_count = len([f for f in all_findings if f.get('priority') == 'P1'])
-    p2_count = len([f for f in all_findings if f.get('priority') == 'P2'])
+    priority_counts = Counter(f.get('priority') for f in all_findings)
+    p0_count = priority_counts['P0']
+    p1_count = priority_counts['P1']
+    p2_count = priority_counts['P2']
     
     return AuditResponse(
         health_score=cfo_report['health_score'] if cfo_report else 100 - (p0_count * 10 + p1_count * 5 + p2_count * 2),
@@ -10,14 +10,187 @@ This agent checks:
 5. Network calls not blocked
 6. GA4 connected and data matches
 """
+import functools
 import json
+import numpy as np
 import pandas as pd
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Generator
 import time
 
 
+# ID columns compared between DV360 and GTM rows. Both sides share one
+# categorical vocabulary so equality checks run on integer codes.
+_SHARED_ID_COLUMNS = (
+    ('Advertiser_ID', 'Advertiser_ID_Config'),
+    ('GTM_Container_Link', 'Container_ID'),
+    ('Floodlight_Activity_ID', 'Linked_Floodlight_ID'),
+)
+
+
+def _share_id_categories(dv360_df: pd.DataFrame, gtm_df: pd.DataFrame) -> None:
+    """Convert paired ID columns to a shared CategoricalDtype (in place)."""
+    for dv_col, gtm_col in _SHARED_ID_COLUMNS:
+        values = pd.concat([dv360_df[dv_col], gtm_df[gtm_col]]).dropna().unique()
+        dtype = pd.CategoricalDtype(categories=values, ordered=False)
+        dv360_df[dv_col] = dv360_df[dv_col].astype(dtype)
+        gtm_df[gtm_col] = gtm_df[gtm_col].astype(dtype)
+
+
+def _missing_pixel_mask(dv360_df: pd.DataFrame) -> pd.Series:
+    """Rows whose Floodlight_Activity_ID is null or the literal 'nan'."""
+    floodlight = dv360_df['Floodlight_Activity_ID']
+    return floodlight.isna() | (floodlight == 'nan')
+
+
+def _lowercase_category(series: pd.Series) -> pd.Series:
+    """Lower-case a low-cardinality text column via its categories (NaN -> 'nan')."""
+    return series.astype('category').str.lower().fillna('nan')
+
+
+# =========================
+# Finding Templates
+# =========================
+# Static text of each finding type; {placeholders} are filled per matching row
+# by _make_finding, so the checks only pass the values that vary.
+_TMPL_MISSING_PIXEL = {
+    "check": "Pixel Created",
+    "priority": "P0",
+    "priority_label": "CRITICAL",
+    "issue": "Missing Floodlight Pixel",
+    "technical_proof": "Floodlight_Activity_ID is null/missing",
+    "reasoning": (
+        "Line Item {line_item} is ACTIVE and spending ${spend:.2f}/day",
+        "No Floodlight pixel is configured for this line item",
+        "Without a pixel, Google cannot track conversions",
+        "The bidding algorithm is optimizing towards NOTHING",
+    ),
+    "recommendation": "Create a Floodlight activity in DV360 and link it to this line item",
+}
+
+_TMPL_DEAD_PIXEL = {
+    "check": "Pixel Firing",
+    "priority": "P0",
+    "priority_label": "CRITICAL",
+    "issue": "Dead Pixel - No Recent Conversions",
+    "technical_proof": "Last_Conversion_Date = {last_date} ({days} days ago)",
+    "reasoning": (
+        "Floodlight {floodlight} last fired {days} days ago",
+        "Daily spend is ${spend:.2f}",
+        "Estimated wasted spend: ${wasted:.2f}",
+        "The algorithm is optimizing towards a dead signal",
+    ),
+    "recommendation": "Check if the pixel is properly placed on the conversion page",
+}
+
+_TMPL_COOKIE_CONSENT = {
+    "check": "Cookie Consent",
+    "priority": "P0",
+    "priority_label": "CRITICAL",
+    "issue": "Cookie Consent Blocking All Data",
+    "technical_proof": "Cookie_Consented_Count = 0, Cookie_Unconsented_Count = 0",
+    "reasoning": (
+        "Both consented and unconsented cookie counts are ZERO",
+        "This means the cookie banner is blocking ALL data collection",
+        "100% of the ${spend:.2f}/day spend has no attribution",
+        "The bidding algorithm cannot learn anything",
+    ),
+    "recommendation": "Review cookie consent implementation - ensure Consent Mode v2 is properly configured",
+}
+
+_TMPL_ADVERTISER_MISMATCH = {
+    "check": "Advertiser ID Match",
+    "priority": "P1",
+    "priority_label": "HIGH",
+    "issue": "Advertiser ID Mismatch Between GTM and DV360",
+    "technical_proof": "DV360 Advertiser: {dv_advertiser} != GTM Config: {gtm_advertiser}",
+    "reasoning": (
+        "GTM tag {tag} has Advertiser ID: {gtm_advertiser}",
+        "DV360 Floodlight expects Advertiser ID: {dv_advertiser}",
+        "This mismatch causes attribution to fail silently",
+        "Conversions are being recorded but not attributed correctly",
+    ),
+    "recommendation": "Update GTM tag to use Advertiser ID: {dv_advertiser}",
+}
+
+_TMPL_COUNTING_MISMATCH = {
+    "check": "Counting Method Match",
+    "priority": "P1",
+    "priority_label": "HIGH",
+    "issue": "Counting Method Mismatch",
+    "technical_proof": "DV360: {dv_method} != GTM: {gtm_method}",
+    "reasoning": (
+        "DV360 expects counting method: {dv_method}",
+        "GTM is configured with: {gtm_method}",
+        "This causes conversion counts to differ between platforms",
+        "Reporting will be inconsistent and unreliable",
+    ),
+    "recommendation": "Align counting method in GTM to match DV360: {dv_method}",
+}
+
+_TMPL_NETWORK_BLOCKED = {
+    "check": "Network Call Status",
+    "priority": "P0",
+    "priority_label": "CRITICAL",
+    "issue": "Floodlight Network Call Blocked",
+    "technical_proof": "Network_Call_Status = 403 BLOCKED",
+    "reasoning": (
+        "The website {url} is blocking Floodlight network calls",
+        "This is typically caused by CSP headers or firewall rules",
+        "The pixel tag exists but cannot send data to Google",
+        "100% of conversions from this page are lost",
+    ),
+    "recommendation": "Ask the advertiser to whitelist fls.doubleclick.net in their CSP/firewall",
+}
+
+_TMPL_MISSING_CONSENT = {
+    "check": "Consent Settings",
+    "priority": "P1",
+    "priority_label": "HIGH",
+    "issue": "Missing Consent Settings in GTM Tag",
+    "technical_proof": "Consent_Settings is null/missing for tag {tag}",
+    "reasoning": (
+        "GTM tag {tag} has no consent settings configured",
+        "Without consent settings, the tag may fire regardless of user consent",
+        "This is a GDPR/privacy compliance risk",
+        "Could result in regulatory fines or account suspension",
+    ),
+    "recommendation": "Add consent settings (ad_storage, analytics_storage) to the tag configuration",
+}
+
+_TMPL_GA4_DISCREPANCY = {
+    "check": "DV360 vs GA4 Discrepancy",
+    "priority": "P1",
+    "priority_label": "HIGH",
+    "issue": "Significant Data Discrepancy Between DV360 and GA4",
+    "technical_proof": "DV360 Clicks: {clicks} vs GA4 Sessions: {sessions} ({discrepancy:.1f}% difference)",
+    "reasoning": (
+        "DV360 recorded {clicks} clicks in the last 24 hours",
+        "GA4 recorded only {sessions} sessions",
+        "This is a {discrepancy:.1f}% discrepancy (threshold: 25%)",
+        "Possible causes: UTM stripping, cross-domain issues, or duplicate pixels",
+    ),
+    "recommendation": "Check for cross-domain tracking issues or duplicate pixel placements",
+}
+
+
+def _make_finding(template: dict, fields: dict, **values) -> dict:
+    """Build a finding dict from a template, formatting its text with `values`."""
+    return {
+        "agent": "Technician",
+        "check": template["check"],
+        "priority": template["priority"],
+        "priority_label": template["priority_label"],
+        "issue": template["issue"],
+        **fields,
+        "technical_proof": template["technical_proof"].format(**values),
+        "reasoning": [line.format(**values) for line in template["reasoning"]],
+        "recommendation": template["recommendation"].format(**values),
+    }
+
+
 class TechnicianAgent:
     """Agent that walks the pixel decision tree programmatically."""
     
@@ -25,21 +198,33 @@ class TechnicianAgent:
         if data_dir is None:
             data_dir = Path(__file__).parent.parent / "data"
         self.data_dir = Path(data_dir)
-        self.decision_tree = self._load_decision_tree()
+        self.decision_tree = self._load_decision_tree(self.data_dir)
         self.findings = []
+        self.finding_counts = Counter()
+        self.retain_findings = True
         self.reasoning_steps = []
         
-    def _load_decision_tree(self) -> dict:
-        """Load the pixel decision tree JSON."""
-        tree_path = self.data_dir / "pixel_decision_tree.json"
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_decision_tree(cls, data_dir: Path) -> dict:
+        """Load the pixel decision tree JSON (parsed once, shared by all instances)."""
+        tree_path = data_dir / "pixel_decision_tree.json"
         with open(tree_path, 'r') as f:
             return json.load(f)
     
     def _load_data(self) -> dict:
         """Load all CSV data files."""
+        dv360_df = pd.read_csv(self.data_dir / "mock_dv360_audit_ready.csv")
+        gtm_df = pd.read_csv(self.data_dir / "mock_gtm_audit_ready.csv")
+        
+        # Lower-case counting methods once per distinct value, not once per row
+        dv360_df['Counting_Method_lc'] = _lowercase_category(dv360_df['Counting_Method'])
+        gtm_df['Configured_Counting_Method_lc'] = _lowercase_category(gtm_df['Configured_Counting_Method'])
+        _share_id_categories(dv360_df, gtm_df)
+        
         return {
-            'dv360': pd.read_csv(self.data_dir / "mock_dv360_audit_ready.csv"),
-            'gtm': pd.read_csv(self.data_dir / "mock_gtm_audit_ready.csv"),
+            'dv360': dv360_df,
+            'gtm': gtm_df,
             'ga4': pd.read_csv(self.data_dir / "mock_ga4_audit_ready.csv"),
             'website': pd.read_csv(self.data_dir / "mock_website_scan_audit_ready.csv")
         }
@@ -54,14 +239,24 @@ class TechnicianAgent:
         self.reasoning_steps.append(log_entry)
         return log_entry
     
-    def run_audit(self, limit: int = None, min_batch_size: int = 20, max_batch_size: int = 30) -> Generator[dict, None, None]:
+    def _record_finding(self, finding: dict) -> dict:
+        """Count a finding (keeping it only if retained) and wrap it as an event."""
+        self.finding_counts[finding['priority']] += 1
+        if self.retain_findings:
+            self.findings.append(finding)
+        return {"type": "finding", "data": finding}
+    
+    def run_audit(self, limit: int = None, min_batch_size: int = 20, max_batch_size: int = 30, retain: bool = True) -> Generator[dict, None, None]:
         """
         Run the full audit using the decision tree logic in batches to simulate live stream.
         Yields findings as they are discovered.
         Batch size is randomized (min-max).
+        With retain=False findings are only counted, not kept for get_summary().
         """
         import random
         self.findings = []
+        self.finding_counts = Counter()
+        self.retain_findings = retain
         self.reasoning_steps = []
         data = self._load_data()
         
@@ -131,36 +326,31 @@ class TechnicianAgent:
         for finding in self._check_consent_settings(gtm_df):
             yield finding
         
-        yield self._log_step(f"✅ Technician Agent completed. Found {len(self.findings)} issues.")
+        yield self._log_step(f"✅ Technician Agent completed. Found {sum(self.finding_counts.values())} issues.")
     def _check_pixel_created(self, dv360_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if Floodlight pixels are created (not nan)."""
-        missing_pixels = dv360_df[dv360_df['Floodlight_Activity_ID'].isna() | 
-                                   (dv360_df['Floodlight_Activity_ID'] == 'nan')]
+        missing_mask = _missing_pixel_mask(dv360_df)
+        if not missing_mask.any():
+            return
         
-        for _, row in missing_pixels.iterrows():
-            finding = {
-                "agent": "Technician",
-                "check": "Pixel Created",
-                "priority": "P0",
-                "priority_label": "CRITICAL",
-                "issue": "Missing Floodlight Pixel",
-                "advertiser_id": row['Advertiser_ID'],
-                "line_item": row['Line_Item_ID'],
-                "daily_spend": row['Daily_Spend'],
-                "technical_proof": f"Floodlight_Activity_ID is null/missing",
-                "reasoning": [
-                    f"Line Item {row['Line_Item_ID']} is ACTIVE and spending ${row['Daily_Spend']:.2f}/day",
-                    "No Floodlight pixel is configured for this line item",
-                    "Without a pixel, Google cannot track conversions",
-                    "The bidding algorithm is optimizing towards NOTHING"
-                ],
-                "recommendation": "Create a Floodlight activity in DV360 and link it to this line item"
-            }
-            self.findings.append(finding)
-            yield {"type": "finding", "data": finding}
+        for _, row in dv360_df[missing_mask].iterrows():
+            finding = _make_finding(
+                _TMPL_MISSING_PIXEL,
+                {
+                    "advertiser_id": row['Advertiser_ID'],
+                    "line_item": row['Line_Item_ID'],
+                    "daily_spend": row['Daily_Spend'],
+                },
+                line_item=row['Line_Item_ID'],
+                spend=row['Daily_Spend'],
+            )
+            yield self._record_finding(finding)
     
     def _check_pixel_firing(self, dv360_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if pixels are actually firing (recent conversions, cookie consent > 0)."""
+        if _missing_pixel_mask(dv360_df).all():
+            return  # No pixels to check; all caught in check 1
+        
         today = datetime.now().date()
         
         for _, row in dv360_df.iterrows():
@@ -173,55 +363,43 @@ class TechnicianAgent:
                 days_since = (today - last_conv).days
                 
                 if days_since > 7:
-                    finding = {
-                        "agent": "Technician",
-                        "check": "Pixel Firing",
-                        "priority": "P0",
-                        "priority_label": "CRITICAL",
-                        "issue": "Dead Pixel - No Recent Conversions",
-                        "advertiser_id": row['Advertiser_ID'],
-                        "floodlight_id": row['Floodlight_Activity_ID'],
-                        "daily_spend": row['Daily_Spend'],
-                        "days_since_conversion": days_since,
-                        "technical_proof": f"Last_Conversion_Date = {row['Last_Conversion_Date']} ({days_since} days ago)",
-                        "reasoning": [
-                            f"Floodlight {row['Floodlight_Activity_ID']} last fired {days_since} days ago",
-                            f"Daily spend is ${row['Daily_Spend']:.2f}",
-                            f"Estimated wasted spend: ${row['Daily_Spend'] * days_since:.2f}",
-                            "The algorithm is optimizing towards a dead signal"
-                        ],
-                        "recommendation": "Check if the pixel is properly placed on the conversion page"
-                    }
-                    self.findings.append(finding)
-                    yield {"type": "finding", "data": finding}
+                    finding = _make_finding(
+                        _TMPL_DEAD_PIXEL,
+                        {
+                            "advertiser_id": row['Advertiser_ID'],
+                            "floodlight_id": row['Floodlight_Activity_ID'],
+                            "daily_spend": row['Daily_Spend'],
+                            "days_since_conversion": days_since,
+                        },
+                        last_date=row['Last_Conversion_Date'],
+                        days=days_since,
+                        floodlight=row['Floodlight_Activity_ID'],
+                        spend=row['Daily_Spend'],
+                        wasted=row['Daily_Spend'] * days_since,
+                    )
+                    yield self._record_finding(finding)
             except:
                 pass
             
             # Check for zero cookie consent
             if row['Cookie_Consented_Count'] == 0 and row['Cookie_Unconsented_Count'] == 0:
-                finding = {
-                    "agent": "Technician",
-                    "check": "Cookie Consent",
-                    "priority": "P0",
-                    "priority_label": "CRITICAL",
-                    "issue": "Cookie Consent Blocking All Data",
-                    "advertiser_id": row['Advertiser_ID'],
-                    "floodlight_id": row['Floodlight_Activity_ID'],
-                    "daily_spend": row['Daily_Spend'],
-                    "technical_proof": f"Cookie_Consented_Count = 0, Cookie_Unconsented_Count = 0",
-                    "reasoning": [
-                        "Both consented and unconsented cookie counts are ZERO",
-                        "This means the cookie banner is blocking ALL data collection",
-                        f"100% of the ${row['Daily_Spend']:.2f}/day spend has no attribution",
-                        "The bidding algorithm cannot learn anything"
-                    ],
-                    "recommendation": "Review cookie consent implementation - ensure Consent Mode v2 is properly configured"
-                }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                finding = _make_finding(
+                    _TMPL_COOKIE_CONSENT,
+                    {
+                        "advertiser_id": row['Advertiser_ID'],
+                        "floodlight_id": row['Floodlight_Activity_ID'],
+                        "daily_spend": row['Daily_Spend'],
+                    },
+                    spend=row['Daily_Spend'],
+                )
+                yield self._record_finding(finding)
     
     def _check_gtm_linkage(self, dv360_df: pd.DataFrame, gtm_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if GTM is linked and Advertiser IDs match."""
+        if _missing_pixel_mask(dv360_df).all() or \
+           not dv360_df['GTM_Container_Link'].isin(gtm_df['Container_ID']).any():
+            return  # No row can have a matching GTM tag
+        
         for _, dv_row in dv360_df.iterrows():
             if pd.isna(dv_row['Floodlight_Activity_ID']) or dv_row['Floodlight_Activity_ID'] == 'nan':
                 continue
@@ -241,30 +419,26 @@ class TechnicianAgent:
             for _, gtm_row in matching_gtm.iterrows():
                 if gtm_row['Advertiser_ID_Config'] == 'ADV_MISMATCH' or \
                    gtm_row['Advertiser_ID_Config'] != dv_row['Advertiser_ID']:
-                    finding = {
-                        "agent": "Technician",
-                        "check": "Advertiser ID Match",
-                        "priority": "P1",
-                        "priority_label": "HIGH",
-                        "issue": "Advertiser ID Mismatch Between GTM and DV360",
-                        "advertiser_id": dv_row['Advertiser_ID'],
-                        "gtm_advertiser_id": gtm_row['Advertiser_ID_Config'],
-                        "floodlight_id": dv_row['Floodlight_Activity_ID'],
-                        "daily_spend": dv_row['Daily_Spend'],
-                        "technical_proof": f"DV360 Advertiser: {dv_row['Advertiser_ID']} != GTM Config: {gtm_row['Advertiser_ID_Config']}",
-                        "reasoning": [
-                            f"GTM tag {gtm_row['Tag_ID']} has Advertiser ID: {gtm_row['Advertiser_ID_Config']}",
-                            f"DV360 Floodlight expects Advertiser ID: {dv_row['Advertiser_ID']}",
-                            "This mismatch causes attribution to fail silently",
-                            "Conversions are being recorded but not attributed correctly"
-                        ],
-                        "recommendation": f"Update GTM tag to use Advertiser ID: {dv_row['Advertiser_ID']}"
-                    }
-                    self.findings.append(finding)
-                    yield {"type": "finding", "data": finding}
+                    finding = _make_finding(
+                        _TMPL_ADVERTISER_MISMATCH,
+                        {
+                            "advertiser_id": dv_row['Advertiser_ID'],
+                            "gtm_advertiser_id": gtm_row['Advertiser_ID_Config'],
+                            "floodlight_id": dv_row['Floodlight_Activity_ID'],
+                            "daily_spend": dv_row['Daily_Spend'],
+                        },
+                        dv_advertiser=dv_row['Advertiser_ID'],
+                        gtm_advertiser=gtm_row['Advertiser_ID_Config'],
+                        tag=gtm_row['Tag_ID'],
+                    )
+                    yield self._record_finding(finding)
     
     def _check_counting_methods(self, dv360_df: pd.DataFrame, gtm_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check if counting methods match between DV360 and GTM."""
+        if _missing_pixel_mask(dv360_df).all() or \
+           not dv360_df['GTM_Container_Link'].isin(gtm_df['Container_ID']).any():
+            return  # No row can have a matching GTM tag
+        
         for _, dv_row in dv360_df.iterrows():
             if pd.isna(dv_row['Floodlight_Activity_ID']) or dv_row['Floodlight_Activity_ID'] == 'nan':
                 continue
@@ -277,83 +451,68 @@ class TechnicianAgent:
             ]
             
             for _, gtm_row in matching_gtm.iterrows():
-                dv_method = str(dv_row['Counting_Method']).lower()
-                gtm_method = str(gtm_row['Configured_Counting_Method']).lower()
+                dv_method = dv_row['Counting_Method_lc']
+                gtm_method = gtm_row['Configured_Counting_Method_lc']
                 
                 if dv_method != gtm_method and gtm_method != 'nan':
-                    finding = {
-                        "agent": "Technician",
-                        "check": "Counting Method Match",
-                        "priority": "P1",
-                        "priority_label": "HIGH",
-                        "issue": "Counting Method Mismatch",
-                        "advertiser_id": dv_row['Advertiser_ID'],
-                        "floodlight_id": dv_row['Floodlight_Activity_ID'],
-                        "dv360_method": dv_row['Counting_Method'],
-                        "gtm_method": gtm_row['Configured_Counting_Method'],
-                        "daily_spend": dv_row['Daily_Spend'],
-                        "technical_proof": f"DV360: {dv_row['Counting_Method']} != GTM: {gtm_row['Configured_Counting_Method']}",
-                        "reasoning": [
-                            f"DV360 expects counting method: {dv_row['Counting_Method']}",
-                            f"GTM is configured with: {gtm_row['Configured_Counting_Method']}",
-                            "This causes conversion counts to differ between platforms",
-                            "Reporting will be inconsistent and unreliable"
-                        ],
-                        "recommendation": f"Align counting method in GTM to match DV360: {dv_row['Counting_Method']}"
-                    }
-                    self.findings.append(finding)
-                    yield {"type": "finding", "data": finding}
+                    finding = _make_finding(
+                        _TMPL_COUNTING_MISMATCH,
+                        {
+                            "advertiser_id": dv_row['Advertiser_ID'],
+                            "floodlight_id": dv_row['Floodlight_Activity_ID'],
+                            "dv360_method": dv_row['Counting_Method'],
+                            "gtm_method": gtm_row['Configured_Counting_Method'],
+                            "daily_spend": dv_row['Daily_Spend'],
+                        },
+                        dv_method=dv_row['Counting_Method'],
+                        gtm_method=gtm_row['Configured_Counting_Method'],
+                    )
+                    yield self._record_finding(finding)
     
     def _check_network_blocked(self, website_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check for blocked network calls on websites."""
-        blocked = website_df[website_df['Network_Call_Status'] == '403 BLOCKED']
+        blocked_mask = website_df['Network_Call_Status'].to_numpy() == '403 BLOCKED'
+        if not blocked_mask.any():
+            return
         
-        for _, row in blocked.iterrows():
-            finding = {
-                "agent": "Technician",
-                "check": "Network Call Status",
-                "priority": "P0",
-                "priority_label": "CRITICAL",
-                "issue": "Floodlight Network Call Blocked",
-                "url": row['URL'],
-                "gtm_container": row['GTM_Container_Found'],
-                "technical_proof": f"Network_Call_Status = 403 BLOCKED",
-                "reasoning": [
-                    f"The website {row['URL']} is blocking Floodlight network calls",
-                    "This is typically caused by CSP headers or firewall rules",
-                    "The pixel tag exists but cannot send data to Google",
-                    "100% of conversions from this page are lost"
-                ],
-                "recommendation": "Ask the advertiser to whitelist fls.doubleclick.net in their CSP/firewall"
-            }
-            self.findings.append(finding)
-            yield {"type": "finding", "data": finding}
+        idx = np.flatnonzero(blocked_mask)
+        urls = website_df['URL'].to_numpy()[idx]
+        containers = website_df['GTM_Container_Found'].to_numpy()[idx]
+        
+        for url, container in zip(urls, containers):
+            finding = _make_finding(
+                _TMPL_NETWORK_BLOCKED,
+                {
+                    "url": url,
+                    "gtm_container": container,
+                },
+                url=url,
+            )
+            yield self._record_finding(finding)
     
     def _check_consent_settings(self, gtm_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check for missing consent settings in GTM."""
-        missing_consent = gtm_df[gtm_df['Consent_Settings'].isna() | (gtm_df['Consent_Settings'] == 'nan')]
+        consent = gtm_df['Consent_Settings']
+        missing_mask = (consent.isna() | (consent == 'nan')).to_numpy()
+        if not missing_mask.any():
+            return
         
-        for _, row in missing_consent.iterrows():
-            finding = {
-                "agent": "Technician",
-                "check": "Consent Settings",
-                "priority": "P1",
-                "priority_label": "HIGH",
-                "issue": "Missing Consent Settings in GTM Tag",
-                "tag_id": row['Tag_ID'],
-                "container_id": row['Container_ID'],
-                "floodlight_id": row['Linked_Floodlight_ID'],
-                "technical_proof": f"Consent_Settings is null/missing for tag {row['Tag_ID']}",
-                "reasoning": [
-                    f"GTM tag {row['Tag_ID']} has no consent settings configured",
-                    "Without consent settings, the tag may fire regardless of user consent",
-                    "This is a GDPR/privacy compliance risk",
-                    "Could result in regulatory fines or account suspension"
-                ],
-                "recommendation": "Add consent settings (ad_storage, analytics_storage) to the tag configuration"
-            }
-            self.findings.append(finding)
-            yield {"type": "finding", "data": finding}
+        idx = np.flatnonzero(missing_mask)
+        tags = gtm_df['Tag_ID'].to_numpy()[idx]
+        containers = gtm_df['Container_ID'].to_numpy()[idx]
+        floodlights = gtm_df['Linked_Floodlight_ID'].to_numpy()[idx]
+        
+        for tag, container, floodlight in zip(tags, containers, floodlights):
+            finding = _make_finding(
+                _TMPL_MISSING_CONSENT,
+                {
+                    "tag_id": tag,
+                    "container_id": container,
+                    "floodlight_id": floodlight,
+                },
+                tag=tag,
+            )
+            yield self._record_finding(finding)
     
     def _check_ga4_discrepancy(self, dv360_df: pd.DataFrame, ga4_df: pd.DataFrame) -> Generator[dict, None, None]:
         """Check for large discrepancies between DV360 clicks and GA4 sessions."""
@@ -365,36 +524,28 @@ class TechnicianAgent:
             discrepancy = abs(total_clicks - total_sessions) / total_clicks * 100
             
             if discrepancy > 25:
-                finding = {
-                    "agent": "Technician",
-                    "check": "DV360 vs GA4 Discrepancy",
-                    "priority": "P1",
-                    "priority_label": "HIGH",
-                    "issue": "Significant Data Discrepancy Between DV360 and GA4",
-                    "dv360_clicks": int(total_clicks),
-                    "ga4_sessions": int(total_sessions),
-                    "discrepancy_percent": round(discrepancy, 1),
-                    "technical_proof": f"DV360 Clicks: {int(total_clicks)} vs GA4 Sessions: {int(total_sessions)} ({discrepancy:.1f}% difference)",
-                    "reasoning": [
-                        f"DV360 recorded {int(total_clicks)} clicks in the last 24 hours",
-                        f"GA4 recorded only {int(total_sessions)} sessions",
-                        f"This is a {discrepancy:.1f}% discrepancy (threshold: 25%)",
-                        "Possible causes: UTM stripping, cross-domain issues, or duplicate pixels"
-                    ],
-                    "recommendation": "Check for cross-domain tracking issues or duplicate pixel placements"
-                }
-                self.findings.append(finding)
-                yield {"type": "finding", "data": finding}
+                finding = _make_finding(
+                    _TMPL_GA4_DISCREPANCY,
+                    {
+                        "dv360_clicks": int(total_clicks),
+                        "ga4_sessions": int(total_sessions),
+                        "discrepancy_percent": round(discrepancy, 1),
+                    },
+                    clicks=int(total_clicks),
+                    sessions=int(total_sessions),
+                    discrepancy=discrepancy,
+                )
+                yield self._record_finding(finding)
     
     def get_summary(self) -> dict:
         """Get a summary of all findings."""
-        p0_count = len([f for f in self.findings if f['priority'] == 'P0'])
-        p1_count = len([f for f in self.findings if f['priority'] == 'P1'])
-        p2_count = len([f for f in self.findings if f['priority'] == 'P2'])
+        p0_count = self.finding_counts['P0']
+        p1_count = self.finding_counts['P1']
+        p2_count = self.finding_counts['P2']
         
         return {
             "agent": "Technician",
-            "total_findings": len(self.findings),
+            "total_findings": sum(self.finding_counts.values()),
             "p0_critical": p0_count,
             "p1_high": p1_count,
             "p2_medium": p2_count,
@@ -12,6 +12,10 @@ Features:
 import streamlit as st
 import time
 import json
+import html
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
 import pandas as pd
 import sys
@@ -21,25 +25,6 @@ from pathlib import Path
 backend_path = Path(__file__).parent.parent / "backend"
 sys.path.insert(0, str(backend_path))
 
-# Lazy imports to avoid startup issues
-TechnicianAgent = None
-AuditorAgent = None
-CFOAgent = None
-AnomalyAgent = None
-
-def load_agents():
-    """Lazy load agents to avoid import issues during startup."""
-    global TechnicianAgent, AuditorAgent, CFOAgent, AnomalyAgent
-    if TechnicianAgent is None:
-        from technician_agent import TechnicianAgent as TA
-        from auditor_agent import AuditorAgent as AA
-        from cfo_agent import CFOAgent as CA
-        from anomaly_agent import AnomalyAgent as AnomA
-        TechnicianAgent = TA
-        AuditorAgent = AA
-        CFOAgent = CA
-        AnomalyAgent = AnomA
-
 # Page config
 st.set_page_config(
     page_title="Watchdog - Account Health Agent",
@@ -49,7 +34,10 @@ st.set_page_config(
 )
 
 # Custom CSS - matching friend's dark gradient design
-st.markdown("""
+@st.cache_data
+def _css() -> str:
+    """Static stylesheet, built once per process."""
+    return """
 <style>
     .stApp {
         background:
@@ -58,27 +46,6 @@ st.markdown("""
             radial-gradient(800px 500px at 70% 100%, rgba(14,165,233,0.25), transparent 55%),
             linear-gradient(180deg, #070b14 0%, #0b1220 50%, #070b14 100%);
     }
-    .finding-p0 {
-        background-color: #ff4b4b;
-        padding: 10px;
-        border-radius: 5px;
-        margin: 5px 0;
-        color: white;
-    }
-    .finding-p1 {
-        background-color: #ffa500;
-        padding: 10px;
-        border-radius: 5px;
-        margin: 5px 0;
-        color: black;
-    }
-    .finding-p2 {
-        background-color: #00cc00;
-        padding: 10px;
-        border-radius: 5px;
-        margin: 5px 0;
-        color: black;
-    }
     .agent-log {
         font-family: 'Courier New', monospace;
         font-size: 12px;
@@ -89,6 +56,27 @@ st.markdown("""
         max-height: 400px;
         overflow-y: auto;
     }
+    .finding-card {
+        border: 1px solid rgba(255,255,255,0.12);
+        border-radius: 8px;
+        padding: 8px 12px;
+        margin: 6px 0;
+    }
+    .finding-card summary {
+        cursor: pointer;
+    }
+    .finding-body {
+        display: grid;
+        grid-template-columns: 2fr 1fr;
+        gap: 16px;
+        margin-top: 10px;
+    }
+    .finding-rec {
+        background: rgba(96,165,250,0.12);
+        border-radius: 8px;
+        padding: 10px 12px;
+        margin-top: 4px;
+    }
     .health-score-good {
         color: #22c55e;
         font-size: 48px;
@@ -104,14 +92,6 @@ st.markdown("""
         font-size: 48px;
         font-weight: bold;
     }
-    .metric-card {
-        background: rgba(255,255,255,0.06);
-        border: 1px solid rgba(255,255,255,0.10);
-        padding: 20px;
-        border-radius: 18px;
-        text-align: center;
-        box-shadow: 0 10px 30px rgba(0,0,0,.35);
-    }
     /* Friend's design elements */
     .anomaly-card {
         background: rgba(255,255,255,0.06);
@@ -201,73 +181,204 @@ st.markdown("""
         font-weight: 650;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Emitted on every run: Streamlit drops elements that a rerun doesn't re-send
+st.markdown(_css(), unsafe_allow_html=True)
+
+
+def get_agents():
+    """Import and build a fresh set of audit agents (lazy to avoid startup issues).
+
+    run_audit keeps per-run counters on the agent, so each session's stream gets its own.
+    """
+    from technician_agent import TechnicianAgent
+    from auditor_agent import AuditorAgent
+    from cfo_agent import CFOAgent
+    return TechnicianAgent(), AuditorAgent(), CFOAgent()
 
 
-def get_health_score_color(score: int) -> str:
-    """Get color class based on health score."""
-    if score >= 70:
-        return "health-score-good"
-    elif score >= 40:
-        return "health-score-warning"
-    else:
-        return "health-score-critical"
+@st.cache_resource
+def get_anomaly_agent():
+    """Build the anomaly agent once per process; its CSVs are loaded on first use."""
+    from anomaly_agent import AnomalyAgent
+    return AnomalyAgent()
 
 
-def display_finding(finding: dict):
-    """Display a single finding with appropriate styling."""
+@st.cache_data(ttl=300)
+def get_advertiser_options() -> dict:
+    """Advertiser selector labels mapped to IDs for the anomaly tab, refreshed every few minutes."""
+    return {f"{a['Advertiser']} | {a['Advertiser ID']}": a['Advertiser ID'] for a in get_anomaly_agent().get_advertisers()}
+
+
+# Reports are kept for an hour; ones whose AI summaries fell back to the template
+# expire sooner so a failed or unparseable LLM reply is retried
+ANALYSIS_TTL_S = 3600
+FALLBACK_ANALYSIS_TTL_S = 120
+
+
+# cache_resource hands back the same objects instead of unpickling a copy of the
+# report (and its Plotly figures) on every hit; the renderer only reads them
+@st.cache_resource
+def _analysis_cache() -> dict:
+    """Advertiser ID -> (expiry on the monotonic clock, (log lines, report)), shared by all sessions."""
+    return {}
+
+
+def analyze_advertiser(adv_id: int) -> tuple:
+    """Run the anomaly analysis (including its LLM summaries) for one advertiser.
+
+    Returns (log lines, report); report is None if the agent produced none.
+    """
+    cache = _analysis_cache()
+    cached = cache.get(adv_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    logs = []
+    report_data = None
+    for event in get_anomaly_agent().analyze(adv_id):
+        if event.get("type") == "step":
+            logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {event['step']}")
+        elif event.get("type") == "anomaly_report":
+            report_data = event["data"]
+    ttl = FALLBACK_ANALYSIS_TTL_S if report_data and report_data.get("ai_fallback") else ANALYSIS_TTL_S
+    cache[adv_id] = (time.monotonic() + ttl, (logs, report_data))
+    return logs, report_data
+
+
+# (epoch second, "HH:MM:SS") of the last log timestamp; one tuple so it swaps atomically
+_last_log_ts = (0, "")
+
+
+def _log_timestamp() -> str:
+    """Timestamp for log lines; strftime only runs when the second rolls over."""
+    global _last_log_ts
+    now = int(time.time())
+    if now != _last_log_ts[0]:
+        _last_log_ts = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+    return _last_log_ts[1]
+
+
+# Expander icon per priority; anything unrecognised is shown as P2
+_PRIORITY_ICONS = {'P0': "🔴", 'P1': "🟡", 'P2': "🟢"}
+
+
+def render_finding_html(finding: dict) -> str:
+    """Build a collapsible card for a single finding."""
+    esc = html.escape
     priority = finding.get('priority', 'P2')
-    priority_label = finding.get('priority_label', 'UNKNOWN')
-    
-    if priority == 'P0':
-        icon = "🔴"
-        bg_color = "#ff4b4b"
-        text_color = "white"
-    elif priority == 'P1':
-        icon = "🟡"
-        bg_color = "#ffa500"
-        text_color = "black"
-    else:
-        icon = "🟢"
-        bg_color = "#00cc00"
-        text_color = "black"
+    icon = _PRIORITY_ICONS.get(priority, "🟢")
+    reasoning = "".join(f"<li>{esc(str(step))}</li>" for step in finding.get('reasoning', []))
+    details = [
+        f"Agent: {esc(str(finding.get('agent', 'Unknown')))}",
+        f"Check: {esc(str(finding.get('check', 'Unknown')))}",
+    ]
+    if finding.get('daily_spend'):
+        details.append(f"Daily Spend: ${finding.get('daily_spend', 0):,.2f}")
+    if finding.get('advertiser_id'):
+        details.append(f"Advertiser: {esc(str(finding.get('advertiser_id')))}")
     
-    with st.expander(f"{icon} {priority} {priority_label}: {finding.get('issue', 'Unknown Issue')}", expanded=False):
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("**Reasoning Chain:**")
-            reasoning = finding.get('reasoning', [])
-            for i, step in enumerate(reasoning, 1):
-                st.markdown(f"{i}. {step}")
-            
-            st.markdown("**Technical Proof:**")
-            st.code(finding.get('technical_proof', 'N/A'))
-        
-        with col2:
-            st.markdown("**Details:**")
-            st.write(f"Agent: {finding.get('agent', 'Unknown')}")
-            st.write(f"Check: {finding.get('check', 'Unknown')}")
-            if finding.get('daily_spend'):
-                st.write(f"Daily Spend: ${finding.get('daily_spend', 0):,.2f}")
-            if finding.get('advertiser_id'):
-                st.write(f"Advertiser: {finding.get('advertiser_id')}")
-            
-            st.markdown("**Recommendation:**")
-            st.info(finding.get('recommendation', 'Review and fix'))
+    return (
+        f"<details class='finding-card'><summary>{icon} {priority} {esc(str(finding.get('priority_label', 'UNKNOWN')))}: "
+        f"{esc(str(finding.get('issue', 'Unknown Issue')))}</summary>"
+        "<div class='finding-body'><div>"
+        f"<strong>Reasoning Chain:</strong><ol>{reasoning}</ol>"
+        f"<strong>Technical Proof:</strong><pre>{esc(str(finding.get('technical_proof', 'N/A'))).replace(chr(10), '<br>')}</pre>"
+        "</div><div>"
+        f"<strong>Details:</strong><br>{'<br>'.join(details)}"
+        f"<br><br><strong>Recommendation:</strong><div class='finding-rec'>{esc(str(finding.get('recommendation', 'Review and fix')))}</div>"
+        "</div></div></details>"
+    )
+
+
+_CFO_CARD_HTML = (
+    '<div style="background-color: #1e1e2e; padding: 15px; border-left: 5px solid #00ff00; margin: 10px 0;">'
+    '<strong>💰 CFO Analysis (Batch #{batch_id} | {batch_size} Records)</strong><br>'
+    '{narrative}'
+    '</div>'
+)
+
+
+def render_cfo_card_html(batch_id: int, batch_size: int, narrative: str) -> str:
+    """Build a CFO batch analysis card."""
+    # The narrative is LLM text: escape it and keep its paragraph breaks as <br>
+    narrative = html.escape(str(narrative)).replace("\n", "<br>")
+    return _CFO_CARD_HTML.format(batch_id=batch_id, batch_size=batch_size, narrative=narrative)
+
+
+_STATS_MD = (
+    "**Total Findings:** {total}  \n"
+    "🔴 P0 Critical: {P0}  \n"
+    "🟡 P1 High: {P1}  \n"
+    "🟢 P2 Medium: {P2}"
+)
+
+
+def collect_batch(gen) -> list:
+    """Pull the events of one batch off an agent generator; safe to run off the script thread."""
+    events = []
+    for event in gen:
+        events.append(event)
+        if event.get("type") == "batch_complete":
+            break
+    return events
+
+
+def should_run_cfo(batch_id: int, has_p0: bool) -> bool:
+    """Only run CFO every 3rd batch OR if there are Critical (P0) issues."""
+    return batch_id % 3 == 0 or has_p0
 
 
 def run_audit_with_streaming(limit: int = 100):
     """Run the audit with continuous streaming display."""
     
-    # Load agents (lazy loading)
-    load_agents()
+    # Permanent Batch Status Indicator in Sidebar (Fixed position)
+    # st.sidebar can't be called from inside a fragment, so it is created here
+    with st.sidebar:
+        st.divider()
+        st.markdown("### 🔄 Live Status")
+        batch_status_container = st.empty()
+        batch_status_container.info("Initializing...")
+        # Kept out of the fragment: toggling it reruns the page, which only re-renders the stream
+        show_p2 = st.checkbox("Show P2 findings", key="show_p2")
+    
+    _stream_fragment(limit, batch_status_container, show_p2)
+
+
+# Much slower simulation as requested: Streamlit reruns the fragment on this cadence
+# instead of the script thread sleeping between turns
+STREAM_INTERVAL_S = 12
+
+
+@st.fragment(run_every=STREAM_INTERVAL_S)
+def _stream_fragment(limit, batch_status_container, show_p2):
+    """Live-stream region; each timed run processes one batch per agent without re-executing the whole script.
+
+    Reruns triggered by widgets only re-render the current state.
+    """
     
     # Initialize session state for persistent tracking across re-runs
+    # Rolling windows: deque(maxlen) drops the oldest entry in O(1)
+    # Findings history, one window per priority, newest first; cards are kept
+    # pre-rendered so repainting the history never re-escapes a finding.
+    # P2 cards are only kept while "Show P2 findings" is on; otherwise P2 is just counted
     if 'findings' not in st.session_state:
-        st.session_state.findings = []
+        st.session_state.findings = {'P0': deque(maxlen=100), 'P1': deque(maxlen=100), 'P2': deque(maxlen=100)}
+    if not show_p2:
+        st.session_state.findings['P2'].clear()
+    if 'cfo_cards' not in st.session_state:
+        st.session_state.cfo_cards = deque(maxlen=5)
+    # Only the 20 lines shown in the log block are kept, already formatted
     if 'logs' not in st.session_state:
-        st.session_state.logs = []
+        st.session_state.logs = deque(maxlen=20)
+    if 'counts' not in st.session_state:
+        st.session_state.counts = {'P0': 0, 'P1': 0, 'P2': 0}
+    # Bound once per run; the closures below hit these on every event
+    findings_state = st.session_state.findings
+    cfo_cards = st.session_state.cfo_cards
+    logs_state = st.session_state.logs
+    counts = st.session_state.counts
     
     # Create layout
     col1, col2 = st.columns([2, 1])
@@ -282,181 +393,476 @@ def run_audit_with_streaming(limit: int = 100):
     
     st.divider()
     
-    # Container for live findings
-    findings_container = st.container()
+    # Latest CFO analyses, then this run's batches, then the findings history
+    # (P0, then P1, then P2 when shown) as of the start of the run
+    cfo_container = st.empty()
+    batch_container = st.container()
+    findings_container = st.empty()
     
-    # Initialize agents
-    technician = TechnicianAgent()
-    auditor = AuditorAgent()
-    cfo = CFOAgent()
+    # Agents and generators live in session state so a rerun resumes the stream
+    # instead of restarting it from the first batch
+    starting = 'stream' not in st.session_state
+    if starting:
+        technician, auditor, cfo = get_agents()
+        st.session_state.stream = {
+            'technician': technician,
+            'auditor': auditor,
+            'cfo': cfo,
+            # Generators (Dynamic Batch Size 20-30)
+            'tech_gen': technician.run_audit(limit=limit, min_batch_size=20, max_batch_size=30, retain=False),
+            'audit_gen': auditor.run_audit(limit=limit, min_batch_size=20, max_batch_size=30, retain=False),
+            'global_batch_id': 1,
+            'last_advance': 0.0,
+            'status': None,
+        }
+    stream = st.session_state.stream
+    # Only the timer moves the stream forward; a second of slack absorbs timer jitter
+    now = time.monotonic()
+    advance = starting or now - stream['last_advance'] >= STREAM_INTERVAL_S - 1
+    technician = stream['technician']
+    auditor = stream['auditor']
+    cfo = stream['cfo']
     
+    # Events are buffered and flushed at most every FLUSH_INTERVAL seconds so the
+    # log, stats and findings are re-rendered a few times per second, not per event
+    FLUSH_INTERVAL = 0.1
+    pending_logs = []
+    # Cards added to each window since the last batch was shown
+    batch_new = dict.fromkeys(counts, 0)
+    last_flush = time.monotonic()
+
     def update_logs(message: str):
-        """Append log and handle rolling window."""
-        st.session_state.logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-        # Keep last 100 logs
-        if len(st.session_state.logs) > 100:
-            st.session_state.logs.pop(0)
-        log_container.markdown(f"<div class='agent-log'>{'<br>'.join(st.session_state.logs[-50:])}</div>", unsafe_allow_html=True)
-
-    def update_stats(findings_list):
-        p0 = len([f for f in findings_list if f.get('priority') == 'P0'])
-        p1 = len([f for f in findings_list if f.get('priority') == 'P1'])
-        p2 = len([f for f in findings_list if f.get('priority') == 'P2'])
-        stats_container.markdown(f"""
-        **Total Findings:** {len(findings_list)}  
-        🔴 P0 Critical: {p0}  
-        🟡 P1 High: {p1}  
-        🟢 P2 Medium: {p2}
-        """)
+        """Queue a log line for the next flush."""
+        pending_logs.append(f"[{_log_timestamp()}] {message}")
 
-    update_logs("🚀 Entering Continuous Interleaved Mode...")
-    progress_bar = st.progress(0, text="Initializing Agents...")
-    
-    # Permanent Batch Status Indicator in Sidebar (Fixed position)
-    with st.sidebar:
-        st.divider()
-        st.markdown("### 🔄 Live Status")
-        batch_status_container = st.empty()
-        batch_status_container.info("Initializing...")
-    
-    # Generators (Dynamic Batch Size 20-30)
-    tech_gen = technician.run_audit(limit=limit, min_batch_size=20, max_batch_size=30)
-    audit_gen = auditor.run_audit(limit=limit, min_batch_size=20, max_batch_size=30)
-    
-    # Infinite Interleaved Loop with Monotonic Batch ID
-    global_batch_id = 1
-    
-    while True:
-        # Much slower simulation as requested
-        import random
-        sleep_time = random.randint(10, 15)
-        time.sleep(sleep_time)
-        # --- Technician Agent Turn ---
+    def flush(force: bool = False):
+        """Render buffered logs and stats if the interval has elapsed."""
+        nonlocal last_flush
+        now = time.monotonic()
+        if not force and now - last_flush < FLUSH_INTERVAL:
+            return
+        last_flush = now
+
+        if pending_logs:
+            logs_state.extend(pending_logs)
+            pending_logs.clear()
+            # Plain-text code block: no Markdown/HTML parsing on every repaint
+            log_container.code("\n".join(logs_state), language=None)
+
+        update_stats()
+
+    def add_finding(finding: dict):
+        """Count a finding and add its card to the history (unknown priorities count as P2).
+
+        P2 cards are only built while they are shown.
+        """
+        p = finding.get('priority')
+        if p not in counts:
+            p = 'P2'
+        counts[p] += 1
+        if p != 'P2' or show_p2:
+            findings_state[p].appendleft(render_finding_html(finding))
+            batch_new[p] += 1
+        return p
+
+    def show_batch():
+        """Emit the cards added during this batch as one element; the history already holds the rest."""
+        cards = "".join("".join(islice(findings_state[p], n)) for p, n in batch_new.items())
+        if cards:
+            batch_container.html(cards)
+        batch_new.update(dict.fromkeys(batch_new, 0))
+
+    def render_history():
+        """Paint the CFO cards and the retained findings; the history is one element, sent once per run.
+
+        Cards added during the run are shown per batch and join the history on the next run.
+        """
+        if cfo_cards:
+            cfo_container.html("".join(cfo_cards))
+        cards = "".join("".join(window) for window in findings_state.values())
+        if cards:
+            findings_container.html(cards)
+
+    def update_stats():
+        stats_container.markdown(_STATS_MD.format_map({'total': sum(counts.values()), **counts}))
+
+    def drain_batch(events, gen_key: str, agent, name: str, emoji: str):
+        """Consume one batch of events from an agent stream (or a prefetched event list).
+
+        Returns (findings, has_p0) for the batch, or None once the stream is exhausted.
+        """
         batch_findings = []
-        try:
-            while True:
-                event = next(tech_gen)
-                event_type = event.get("type")
-                
-                if event_type == "finding":
-                    st.session_state.findings.insert(0, event["data"]) # Add to top
-                    # Memory Cap: Keep only last 100 findings to prevent crash
-                    if len(st.session_state.findings) > 100:
-                        st.session_state.findings.pop()
-                    
-                    batch_findings.append(event["data"])
-                    # Display finding if P0 or P1
-                    if event["data"].get("priority") in ["P0", "P1"]:
-                        with findings_container:
-                            display_finding(event["data"])
-                
-                elif event_type == "batch_start":
-                    # Internal batch_id from agent is ignored for display
-                    # internal_id = event.get("batch_id")
-                    batch_size = event.get("size", 0)
-                    batch_status_container.info(f"**Batch #{global_batch_id}**\n\n📊 Size: {batch_size} rows")
-                    progress_bar.progress(1.0, text=f"🔧 Technician: Analyzing Batch #{global_batch_id} ({batch_size} rows)...")
-                
-                elif event.get("step"):
-                    update_logs(f"[Batch {global_batch_id}] 🔧 Technician Agent: {event['step']}")
-                
-                elif event_type == "batch_complete":
-                     break
-                     
-                time.sleep(0.05)
-                
-        except StopIteration:
-            update_logs(f"Note: Data source exhausted. Resetting Technician stream...")
-            tech_gen = technician.run_audit(limit=limit, min_batch_size=20, max_batch_size=30)
-            time.sleep(0.5)
-            continue # Skip CFO for this partial/empty turn
+        batch_has_p0 = False
+        for event in events:
+            event_type = event.get("type")
             
-        # Run CFO on Technician Batch Findings (Limited frequency to save API quota)
-        # Only run every 3rd batch OR if there are Critical (P0) issues
-        should_run_chob = (global_batch_id % 3 == 0) or any(f.get('priority') == 'P0' for f in batch_findings)
-        
-        if batch_findings and should_run_chob:
-             update_logs(f"💰 CFO Agent: Analyzing financial impact of Batch #{global_batch_id}...")
-             for event in cfo.analyze(batch_findings, batch_id=global_batch_id, batch_size=len(batch_findings)):
-                 if event.get("step"):
-                     # CFO steps already contain agent name, just show batch context if not redundant
-                     update_logs(f"[Batch {global_batch_id}] {event['step']}")
-                 if event.get("type") == "cfo_report":
-                     reportn = event["data"]
-                     b_size = reportn.get('batch_size', len(batch_findings))
-                     with findings_container:
-                         st.markdown(f"""
-                         <div style="background-color: #1e1e2e; padding: 15px; border-left: 5px solid #00ff00; margin: 10px 0;">
-                             <strong>💰 CFO Analysis (Batch #{global_batch_id} | {b_size} Records)</strong><br>
-                             {reportn.get('executive_narrative', 'No financial impact detected.')}
-                         </div>
-                         """, unsafe_allow_html=True)
-        elif batch_findings:
-             update_logs(f"💰 CFO Agent: Performing standard risk assessment for Batch #{global_batch_id} (Rapid Mode)")
-                         
-        global_batch_id += 1
+            # Reasoning steps are the only untyped events, so they skip the type chain
+            if event_type is None:
+                step = event.get("step")
+                if step:
+                    update_logs(f"[Batch {global_batch_id}] {emoji} {name} Agent: {step}")
+            
+            elif event_type == "finding":
+                finding = event["data"]
+                if add_finding(finding) == 'P0': # Add to top
+                    batch_has_p0 = True
+                batch_findings.append(finding)
+            
+            elif event_type == "batch_start":
+                # Internal batch_id from agent is ignored for display
+                batch_size = event.get("size", 0)
+                stream['status'] = f"**Batch #{global_batch_id}**\n\n📊 Size: {batch_size} rows"
+                batch_status_container.info(stream['status'])
+                progress_bar.progress(1.0, text=f"{emoji} {name}: Analyzing Batch #{global_batch_id} ({batch_size} rows)...")
+            
+            elif event_type == "batch_complete":
+                break
+            
+            flush()
+        else:
+            update_logs(f"Note: Data source exhausted. Resetting {name} stream...")
+            show_batch()
+            flush(force=True)
+            stream[gen_key] = agent.run_audit(limit=limit, min_batch_size=20, max_batch_size=30, retain=False)
+            return None
         
-        # --- Auditor Agent Turn ---
-        batch_findings = []
-        try:
-             while True:
-                event = next(audit_gen)
-                event_type = event.get("type")
-                
-                if event_type == "finding":
-                    st.session_state.findings.insert(0, event["data"])
-                    if len(st.session_state.findings) > 100: st.session_state.findings.pop()
-                    batch_findings.append(event["data"])
-                    if event["data"].get("priority") in ["P0", "P1"]:
-                        with findings_container:
-                            display_finding(event["data"])
-
-                elif event_type == "batch_start":
-                    batch_size = event.get("size", 0)
-                    batch_status_container.info(f"**Batch #{global_batch_id}**\n\n📊 Size: {batch_size} rows")
-                    progress_bar.progress(1.0, text=f"📋 Auditor: Analyzing Batch #{global_batch_id} ({batch_size} rows)...")
-                
-                elif event.get("step"):
-                    update_logs(f"[Batch {global_batch_id}] 📋 Auditor Agent: {event['step']}")
-                    
-                elif event_type == "batch_complete":
-                     break
-                     
-                time.sleep(0.05)
+        show_batch()
+        flush(force=True)
+        return batch_findings, batch_has_p0
+
+    # Repaint the stream as it stands; a widget rerun stops here without pulling another batch
+    if logs_state:
+        log_container.code("\n".join(logs_state), language=None)
+    if stream['status']:
+        batch_status_container.info(stream['status'])
+    update_stats()
+    render_history()
+    if not advance:
+        return
+    stream['last_advance'] = now
+
+    if starting:
+        update_logs("🚀 Entering Continuous Interleaved Mode...")
+    flush(force=True)
+    progress_bar = st.progress(0, text="Initializing Agents...")
+    
+    def agent_turn(gen_key: str, agent, name: str, emoji: str, cfo_focus: str, cfo_fallback: str, rapid_mode_note: bool = False, events=None):
+        """Drain one batch (live from the generator unless events were prefetched) and, when gated in, start CFO on it.
+
+        Returns the pending CFO run for finish_cfo, or None.
+        """
+        nonlocal global_batch_id
+        batch = drain_batch(stream[gen_key] if events is None else events, gen_key, agent, name, emoji)
+        if batch is None:
+            return None # Skip CFO for this partial/empty turn
+        batch_findings, batch_has_p0 = batch
         
-        except StopIteration:
-            update_logs(f"Note: Data source exhausted. Resetting Auditor stream...")
-            audit_gen = auditor.run_audit(limit=limit, min_batch_size=20, max_batch_size=30)
-            time.sleep(0.5)
-            continue
-
-        # Run CFO on Auditor Batch Findings (Limited frequency)
-        should_run_audit_cfo = (global_batch_id % 3 == 0) or any(f.get('priority') == 'P0' for f in batch_findings)
+        # Run CFO on Batch Findings (Limited frequency to save API quota)
+        pending_cfo = None
+        if batch_findings and should_run_cfo(global_batch_id, batch_has_p0):
+            update_logs(f"💰 CFO Agent: Analyzing {cfo_focus} of Batch #{global_batch_id}...")
+            # The narrative is an LLM call, so the CFO generator runs on the worker pool
+            cfo_run = pool.submit(list, cfo.analyze(batch_findings, batch_id=global_batch_id, batch_size=len(batch_findings)))
+            pending_cfo = (cfo_run, global_batch_id, len(batch_findings), cfo_fallback)
+        elif batch_findings and rapid_mode_note:
+            update_logs(f"💰 CFO Agent: Performing standard risk assessment for Batch #{global_batch_id} (Rapid Mode)")
         
-        if batch_findings and should_run_audit_cfo:
-             update_logs(f"💰 CFO Agent: Analyzing governance risk of Batch #{global_batch_id}...")
-             for event in cfo.analyze(batch_findings, batch_id=global_batch_id, batch_size=len(batch_findings)):
-                 if event.get("step"):
-                     update_logs(f"[Batch {global_batch_id}] {event['step']}")
-                 if event.get("type") == "cfo_report":
-                     reportn = event["data"]
-                     b_size = reportn.get('batch_size', len(batch_findings))
-                     with findings_container:
-                         st.markdown(f"""
-                         <div style="background-color: #1e1e2e; padding: 15px; border-left: 5px solid #00ff00; margin: 10px 0;">
-                             <strong>💰 CFO Analysis (Batch #{global_batch_id} | {b_size} Records)</strong><br>
-                             {reportn.get('executive_narrative', 'No compliance risk details.')}
-                         </div>
-                         """, unsafe_allow_html=True)
-
         global_batch_id += 1
+        stream['global_batch_id'] = global_batch_id
+        return pending_cfo
+
+    def finish_cfo(pending_cfo):
+        """Wait for a CFO run started by agent_turn, then replay its steps and show its card."""
+        if pending_cfo is None:
+            return
+        cfo_run, batch_id, batch_size, cfo_fallback = pending_cfo
+        for event in cfo_run.result():
+            if event.get("step"):
+                # CFO steps already contain agent name, just show batch context if not redundant
+                update_logs(f"[Batch {batch_id}] {event['step']}")
+            if event.get("type") == "cfo_report":
+                flush(force=True)
+                reportn = event["data"]
+                b_size = reportn.get('batch_size', batch_size)
+                card = render_cfo_card_html(batch_id, b_size, reportn.get('executive_narrative', cfo_fallback))
+                cfo_cards.appendleft(card)
+                batch_container.html(card)
+
+    # One Technician + Auditor turn per tick, with a monotonic batch ID across ticks
+    global_batch_id = stream['global_batch_id']
+    
+    # The agents read independent data, so the Auditor batch is pulled on a worker
+    # thread while the Technician batch streams; its events are replayed afterwards.
+    # The Technician's CFO run overlaps the rest of that prefetch; CFO runs themselves
+    # stay sequential since they share one CFOAgent.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        audit_events = pool.submit(collect_batch, stream['audit_gen'])
+        finish_cfo(agent_turn('tech_gen', technician, "Technician", "🔧", "financial impact", 'No financial impact detected.', rapid_mode_note=True))
+        finish_cfo(agent_turn('audit_gen', auditor, "Auditor", "📋", "governance risk", 'No compliance risk details.', events=audit_events.result()))
+
+    # Update global stats
+    flush(force=True)
+
+
+# Static anomaly-tab markup, built once at import
+_ANOMALY_HEADER_HTML = """
+<div class='anomaly-card'>
+    <div style="display:flex; justify-content:space-between; align-items:flex-start;">
+        <div>
+            <div class='section-title'>Account Health • Fix AI Agent</div>
+            <div style="font-size:28px; font-weight:900; line-height:1.15;">
+                Problem → Cause → Fix
+            </div>
+            <div style="margin-top:8px; font-size:14px; color: rgba(255,255,255,0.65);">
+                Fast dashboard + AI Agent Insights for Floodlight anomalies
+            </div>
+        </div>
+        <div class='pill'>
+            <span class='dot dot-excellent'></span>
+            <span>LLM Ready</span>
+        </div>
+    </div>
+</div>
+"""
+
+_ANOMALY_PLACEHOLDER_HTML = """
+<div class='anomaly-card'>
+    <div style="font-size:18px; font-weight:700;">👆 Select an advertiser and click 'Analyze Data Anomalies'</div>
+    <div style="margin-top:12px; color:rgba(255,255,255,0.75);">
+        This tab analyzes Floodlight conversion data for anomalies:
+    </div>
+    <div style="margin-top:16px; display:grid; grid-template-columns: repeat(3, 1fr); gap:12px;">
+        <div class='kpi-card'>
+            <div style="font-size:20px;">📈</div>
+            <div style="font-weight:700; margin-top:4px;">Spike Detection</div>
+            <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Sudden surges in Floodlight impressions</div>
+        </div>
+        <div class='kpi-card'>
+            <div style="font-size:20px;">❌</div>
+            <div style="font-weight:700; margin-top:4px;">Missing Data</div>
+            <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Floodlight activities that stopped firing</div>
+        </div>
+        <div class='kpi-card'>
+            <div style="font-size:20px;">🤖</div>
+            <div style="font-weight:700; margin-top:4px;">AI Insights</div>
+            <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Root cause analysis via Groq LLM</div>
+        </div>
+    </div>
+</div>
+"""
+
+_AI_BOX_HTML = """
+<div class='ai-box'>
+    <div style="display:flex; justify-content:space-between; align-items:center;">
+        <div style="font-size:16px; font-weight:900;">{title}</div>
+        <div class='pill'><span class='dot {dot_class}'></span>{count_label}</div>
+    </div>
+    <div style="margin-top:12px;">
+        <div><b>Summary:</b> {summary}</div>
+        <div style="margin-top:8px;"><b>Root Cause:</b> {root_cause}</div>
+    </div>
+    {recommendations}
+</div>
+"""
+
+
+def render_ai_box(title: str, dot_class: str, count_label: str, ai: dict) -> str:
+    """Build an AI-summary box, recommendations included; the LLM text is escaped."""
+    recs = ai.get("recommendations", [])
+    recommendations = ""
+    if recs:
+        items = "".join(f"<li>{html.escape(str(r))}</li>" for r in recs[:5])
+        recommendations = f"<div style='margin-top:12px;'><b>Recommendations:</b><ul style='margin:6px 0 0 0;'>{items}</ul></div>"
+    return _AI_BOX_HTML.format(
+        title=title,
+        dot_class=dot_class,
+        count_label=count_label,
+        summary=html.escape(str(ai.get('summary', 'N/A'))),
+        root_cause=html.escape(str(ai.get('likely_root_cause', 'N/A'))),
+        recommendations=recommendations,
+    )
 
-        # Update global stats
-        if len(st.session_state.findings) > 200:
-             st.session_state.findings = st.session_state.findings[:200]
+
+def display_problem_table(df, empty_message: str, height: int = 400):
+    """Show a detected-problems table in a fixed-height grid; st.dataframe only draws the visible rows."""
+    if df is None or not df.size:
+        st.success(empty_message)
+        return
+    st.dataframe(df, use_container_width=True, hide_index=True, height=height)
+
+
+@st.fragment
+def anomaly_dashboard():
+    """Data anomaly tab; its widgets rerun only this fragment, not the live audit stream."""
+    try:
+        adv_options = get_advertiser_options()
         
-        update_stats(st.session_state.findings)
-        time.sleep(0.1)
+        if not adv_options:
+            st.warning("No advertisers found in the data files.")
+        else:
+            # Header card matching friend's design
+            st.html(_ANOMALY_HEADER_HTML)
+            
+            # Advertiser selector
+            selected_adv = st.selectbox("Select Advertiser", list(adv_options.keys()), key="adv_selector")
+            adv_id = adv_options[selected_adv]
+            
+            # Run analysis button
+            if st.button("🔍 Analyze Data Anomalies", type="primary", use_container_width=True, key="run_anomaly_btn"):
+                
+                # Run analysis (cached per advertiser, so repeat runs skip the LLM calls)
+                with st.spinner("Analyzing data anomalies..."):
+                    logs, report_data = analyze_advertiser(adv_id)
+                
+                if not report_data:
+                    st.markdown(f"<div class='agent-log'>{'<br>'.join(logs[-10:])}</div>", unsafe_allow_html=True)
+                else:
+                    health = report_data["health"]
+                    summary = report_data["overall_summary"]
+                    
+                    # Get dot class based on health band
+                    band = health.get("band", "").lower()
+                    dot_class = "dot-excellent" if "excellent" in band else ("dot-good" if "good" in band else ("dot-fair" if "fair" in band else "dot-poor"))
+                    score_class = "health-score-good" if health["score"] >= 75 else ("health-score-warning" if health["score"] >= 55 else "health-score-critical")
+                    
+                    # KPI Cards row (matching friend's grid-4)
+                    st.markdown("<div class='section-title'>Key Metrics</div>", unsafe_allow_html=True)
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        st.html(f"""
+                        <div class='kpi-card'>
+                            <div class='kpi-label'>Health Score</div>
+                            <div class='kpi-value'><span class='{score_class}'>{health['score']}</span>/100</div>
+                            <div class='pill' style='margin-top:8px;'><span class='dot {dot_class}'></span>{health['band']}</div>
+                        </div>
+                        """)
+                    
+                    with col2:
+                        st.html(f"""
+                        <div class='kpi-card'>
+                            <div class='kpi-label'>Spike Days</div>
+                            <div class='kpi-value'>{health['spike_days']}</div>
+                            <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Days with spike flags</div>
+                        </div>
+                        """)
+                    
+                    with col3:
+                        st.html(f"""
+                        <div class='kpi-card'>
+                            <div class='kpi-label'>Missing Events</div>
+                            <div class='kpi-value'>{report_data['missing_events_total']}</div>
+                            <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Total missing rows</div>
+                        </div>
+                        """)
+                    
+                    with col4:
+                        st.html(f"""
+                        <div class='kpi-card'>
+                            <div class='kpi-label'>Days in Window</div>
+                            <div class='kpi-value'>{health['days_in_window']}</div>
+                            <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Distinct GA4 dates</div>
+                        </div>
+                        """)
+                    
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    
+                    # Overall Summary Card (matching friend's design)
+                    st.html(f"""
+                    <div class='anomaly-card'>
+                        <div style="display:flex; justify-content:space-between; align-items:center;">
+                            <div>
+                                <div class='section-title'>Overall Summary</div>
+                                <div style="font-size:22px; font-weight:950; line-height:1.2;">
+                                    {summary['adv_name']} — Tracking reliability snapshot
+                                </div>
+                            </div>
+                            <div class='pill'>
+                                <span class='dot {dot_class}'></span>
+                                <span>{summary['verdict']}</span>
+                            </div>
+                        </div>
+                        <div style="height:12px;"></div>
+                        <div class='verdict-box'>
+                            <div style="font-weight:900; font-size:14px;">Reliability Verdict</div>
+                            <div style="margin-top:6px; font-size:13px; color:rgba(255,255,255,0.85);">
+                                {summary['verdict_reason']}
+                            </div>
+                        </div>
+                    </div>
+                    """)
+                    
+                    # Top Spike Drivers
+                    if summary.get("top_drivers"):
+                        st.markdown("<div class='section-title'>Spike Drivers (GA4 Channel Dominance)</div>", unsafe_allow_html=True)
+                        driver_df = pd.DataFrame(summary["top_drivers"])
+                        st.dataframe(driver_df, use_container_width=True, hide_index=True)
+                    
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    
+                    # AI Summaries (matching friend's ai-box design)
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        ai_missing = report_data["ai_summaries"].get("missing", {})
+                        missing_table = report_data.get("missing_table")
+                        missing_count = len(missing_table) if missing_table is not None else 0
+                        st.html(render_ai_box("🛑 Missing Floodlights — AI Summary", "dot-poor", f"{missing_count} ranges", ai_missing))
+                        st.markdown("""<a class='btn-gtm' href='https://tagmanager.google.com/' target='_blank'>🟢 Go to Google Tag Manager →</a>""", unsafe_allow_html=True)
+                    
+                    with col2:
+                        ai_spike = report_data["ai_summaries"].get("spike", {})
+                        spike_table = report_data.get("spike_table")
+                        spike_count = len(spike_table) if spike_table is not None else 0
+                        st.html(render_ai_box("📈 Spikes — AI Summary", "dot-fair", f"{spike_count} spikes", ai_spike))
+                        st.markdown("""<a class='btn-ga4' href='https://analytics.google.com/' target='_blank'>🔴 Go to GA4 Analytics →</a>""", unsafe_allow_html=True)
+                    
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    
+                    # Charts section
+                    st.markdown("<div class='section-title'>Trends & Visualizations</div>", unsafe_allow_html=True)
+                    charts = report_data.get("charts", {})
+                    
+                    if charts.get("issue_history"):
+                        st.plotly_chart(charts["issue_history"], use_container_width=True)
+                    
+                    if charts.get("ga4_impressions"):
+                        st.plotly_chart(charts["ga4_impressions"], use_container_width=True)
+                    
+                    # Channel Totals
+                    if report_data.get("channel_totals"):
+                        st.markdown("<div class='section-title'>Channel Session Totals</div>", unsafe_allow_html=True)
+                        # All channels in one element; the grid replaces st.columns(5)
+                        channel_cards = "".join(
+                            f"<div class='kpi-card'><div class='kpi-label'>{channel}</div>"
+                            f"<div class='kpi-value' style='font-size:20px;'>{sessions:,.0f}</div></div>"
+                            for channel, sessions in report_data["channel_totals"].items()
+                        )
+                        st.html(f"<div style='display:grid; grid-template-columns:repeat(5, 1fr); gap:16px;'>{channel_cards}</div>")
+                    
+                    if charts.get("channel_trend"):
+                        st.plotly_chart(charts["channel_trend"], use_container_width=True)
+                    
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    
+                    # Problem Tables
+                    st.markdown("<div class='section-title'>Detected Problems</div>", unsafe_allow_html=True)
+                    
+                    ptab1, ptab2 = st.tabs(["📈 Spikes", "❌ Missing Data"])
+                    
+                    with ptab1:
+                        display_problem_table(report_data.get("spike_table"), "No sudden spikes detected!")
+                    
+                    with ptab2:
+                        display_problem_table(report_data.get("missing_table"), "No missing floodlight data detected!")
+            
+            else:
+                # Placeholder when not running (matching friend's style)
+                st.html(_ANOMALY_PLACEHOLDER_HTML)
+    
+    except Exception as e:
+        st.error(f"Error loading anomaly detection: {e}")
+        st.info("Make sure the data files exist in data/anomalies/")
 
 
 def main():
@@ -507,6 +913,12 @@ def main():
         run_button = st.button("🚀 Run Account Audit", type="primary", use_container_width=True, key="run_audit_btn")
         
         if run_button:
+            # Each click starts a fresh audit instead of resuming the previous stream
+            for key in ('stream', 'findings', 'cfo_cards', 'logs', 'counts'):
+                st.session_state.pop(key, None)
+            st.session_state.audit_running = True
+        
+        if st.session_state.get('audit_running'):
             # Continuous streaming mode - runs indefinitely displaying findings live
             run_audit_with_streaming(limit=limit)
         
@@ -542,274 +954,7 @@ def main():
     # TAB 2: DATA ANOMALY DETECTION (Friend's Design)
     # ============================================
     with main_tab2:
-        # Load agents
-        load_agents()
-        
-        try:
-            anomaly_agent = AnomalyAgent()
-            advertisers = anomaly_agent.get_advertisers()
-            
-            if not advertisers:
-                st.warning("No advertisers found in the data files.")
-            else:
-                # Header card matching friend's design
-                st.markdown("""
-                <div class='anomaly-card'>
-                    <div style="display:flex; justify-content:space-between; align-items:flex-start;">
-                        <div>
-                            <div class='section-title'>Account Health • Fix AI Agent</div>
-                            <div style="font-size:28px; font-weight:900; line-height:1.15;">
-                                Problem → Cause → Fix
-                            </div>
-                            <div style="margin-top:8px; font-size:14px; color: rgba(255,255,255,0.65);">
-                                Fast dashboard + AI Agent Insights for Floodlight anomalies
-                            </div>
-                        </div>
-                        <div class='pill'>
-                            <span class='dot dot-excellent'></span>
-                            <span>LLM Ready</span>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Advertiser selector
-                adv_options = {f"{a['Advertiser']} | {a['Advertiser ID']}": a['Advertiser ID'] for a in advertisers}
-                selected_adv = st.selectbox("Select Advertiser", list(adv_options.keys()), key="adv_selector")
-                adv_id = adv_options[selected_adv]
-                
-                # Run analysis button
-                if st.button("🔍 Analyze Data Anomalies", type="primary", use_container_width=True, key="run_anomaly_btn"):
-                    
-                    # Log container
-                    log_placeholder = st.empty()
-                    logs = []
-                    
-                    # Run analysis
-                    report_data = None
-                    for event in anomaly_agent.analyze(adv_id):
-                        if event.get("type") == "step":
-                            logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {event['step']}")
-                            log_placeholder.markdown(f"<div class='agent-log'>{'<br>'.join(logs[-10:])}</div>", unsafe_allow_html=True)
-                            time.sleep(0.1)
-                        elif event.get("type") == "anomaly_report":
-                            report_data = event["data"]
-                    
-                    if report_data:
-                        log_placeholder.empty()
-                        
-                        health = report_data["health"]
-                        summary = report_data["overall_summary"]
-                        
-                        # Get dot class based on health band
-                        band = health.get("band", "").lower()
-                        dot_class = "dot-excellent" if "excellent" in band else ("dot-good" if "good" in band else ("dot-fair" if "fair" in band else "dot-poor"))
-                        score_class = "health-score-good" if health["score"] >= 75 else ("health-score-warning" if health["score"] >= 55 else "health-score-critical")
-                        
-                        # KPI Cards row (matching friend's grid-4)
-                        st.markdown("<div class='section-title'>Key Metrics</div>", unsafe_allow_html=True)
-                        col1, col2, col3, col4 = st.columns(4)
-                        
-                        with col1:
-                            st.markdown(f"""
-                            <div class='kpi-card'>
-                                <div class='kpi-label'>Health Score</div>
-                                <div class='kpi-value'><span class='{score_class}'>{health['score']}</span>/100</div>
-                                <div class='pill' style='margin-top:8px;'><span class='dot {dot_class}'></span>{health['band']}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col2:
-                            st.markdown(f"""
-                            <div class='kpi-card'>
-                                <div class='kpi-label'>Spike Days</div>
-                                <div class='kpi-value'>{health['spike_days']}</div>
-                                <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Days with spike flags</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col3:
-                            st.markdown(f"""
-                            <div class='kpi-card'>
-                                <div class='kpi-label'>Missing Events</div>
-                                <div class='kpi-value'>{report_data['missing_events_total']}</div>
-                                <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Total missing rows</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col4:
-                            st.markdown(f"""
-                            <div class='kpi-card'>
-                                <div class='kpi-label'>Days in Window</div>
-                                <div class='kpi-value'>{health['days_in_window']}</div>
-                                <div style='font-size:12px; color:rgba(255,255,255,0.65);'>Distinct GA4 dates</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
-                        # Overall Summary Card (matching friend's design)
-                        st.markdown(f"""
-                        <div class='anomaly-card'>
-                            <div style="display:flex; justify-content:space-between; align-items:center;">
-                                <div>
-                                    <div class='section-title'>Overall Summary</div>
-                                    <div style="font-size:22px; font-weight:950; line-height:1.2;">
-                                        {summary['adv_name']} — Tracking reliability snapshot
-                                    </div>
-                                </div>
-                                <div class='pill'>
-                                    <span class='dot {dot_class}'></span>
-                                    <span>{summary['verdict']}</span>
-                                </div>
-                            </div>
-                            <div style="height:12px;"></div>
-                            <div class='verdict-box'>
-                                <div style="font-weight:900; font-size:14px;">Reliability Verdict</div>
-                                <div style="margin-top:6px; font-size:13px; color:rgba(255,255,255,0.85);">
-                                    {summary['verdict_reason']}
-                                </div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Top Spike Drivers
-                        if summary.get("top_drivers"):
-                            st.markdown("<div class='section-title'>Spike Drivers (GA4 Channel Dominance)</div>", unsafe_allow_html=True)
-                            driver_df = pd.DataFrame(summary["top_drivers"])
-                            st.dataframe(driver_df, use_container_width=True, hide_index=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
-                        # AI Summaries (matching friend's ai-box design)
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            ai_missing = report_data["ai_summaries"].get("missing", {})
-                            missing_table = report_data.get("missing_table")
-                            missing_count = len(missing_table) if missing_table is not None else 0
-                            st.markdown(f"""
-                            <div class='ai-box'>
-                                <div style="display:flex; justify-content:space-between; align-items:center;">
-                                    <div style="font-size:16px; font-weight:900;">🛑 Missing Floodlights — AI Summary</div>
-                                    <div class='pill'><span class='dot dot-poor'></span>{missing_count} ranges</div>
-                                </div>
-                                <div style="margin-top:12px;">
-                                    <div><b>Summary:</b> {ai_missing.get('summary', 'N/A')}</div>
-                                    <div style="margin-top:8px;"><b>Root Cause:</b> {ai_missing.get('likely_root_cause', 'N/A')}</div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            recs = ai_missing.get("recommendations", [])
-                            if recs:
-                                st.markdown("**Recommendations:**")
-                                for r in recs[:5]:
-                                    st.markdown(f"- {r}")
-                            st.markdown("""<a class='btn-gtm' href='https://tagmanager.google.com/' target='_blank'>🟢 Go to Google Tag Manager →</a>""", unsafe_allow_html=True)
-                        
-                        with col2:
-                            ai_spike = report_data["ai_summaries"].get("spike", {})
-                            spike_table = report_data.get("spike_table")
-                            spike_count = len(spike_table) if spike_table is not None else 0
-                            st.markdown(f"""
-                            <div class='ai-box'>
-                                <div style="display:flex; justify-content:space-between; align-items:center;">
-                                    <div style="font-size:16px; font-weight:900;">📈 Spikes — AI Summary</div>
-                                    <div class='pill'><span class='dot dot-fair'></span>{spike_count} spikes</div>
-                                </div>
-                                <div style="margin-top:12px;">
-                                    <div><b>Summary:</b> {ai_spike.get('summary', 'N/A')}</div>
-                                    <div style="margin-top:8px;"><b>Root Cause:</b> {ai_spike.get('likely_root_cause', 'N/A')}</div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            recs = ai_spike.get("recommendations", [])
-                            if recs:
-                                st.markdown("**Recommendations:**")
-                                for r in recs[:5]:
-                                    st.markdown(f"- {r}")
-                            st.markdown("""<a class='btn-ga4' href='https://analytics.google.com/' target='_blank'>🔴 Go to GA4 Analytics →</a>""", unsafe_allow_html=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
-                        # Charts section
-                        st.markdown("<div class='section-title'>Trends & Visualizations</div>", unsafe_allow_html=True)
-                        charts = report_data.get("charts", {})
-                        
-                        if charts.get("issue_history"):
-                            st.plotly_chart(charts["issue_history"], use_container_width=True)
-                        
-                        if charts.get("ga4_impressions"):
-                            st.plotly_chart(charts["ga4_impressions"], use_container_width=True)
-                        
-                        # Channel Totals
-                        if report_data.get("channel_totals"):
-                            st.markdown("<div class='section-title'>Channel Session Totals</div>", unsafe_allow_html=True)
-                            ch_cols = st.columns(5)
-                            for i, (channel, sessions) in enumerate(report_data["channel_totals"].items()):
-                                with ch_cols[i % 5]:
-                                    st.markdown(f"""
-                                    <div class='kpi-card'>
-                                        <div class='kpi-label'>{channel}</div>
-                                        <div class='kpi-value' style='font-size:20px;'>{sessions:,.0f}</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                        
-                        if charts.get("channel_trend"):
-                            st.plotly_chart(charts["channel_trend"], use_container_width=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
-                        # Problem Tables
-                        st.markdown("<div class='section-title'>Detected Problems</div>", unsafe_allow_html=True)
-                        
-                        ptab1, ptab2 = st.tabs(["📈 Spikes", "❌ Missing Data"])
-                        
-                        with ptab1:
-                            spike_table = report_data.get("spike_table")
-                            if spike_table is not None and not spike_table.empty:
-                                st.dataframe(spike_table.head(50), use_container_width=True, hide_index=True)
-                            else:
-                                st.success("No sudden spikes detected!")
-                        
-                        with ptab2:
-                            missing_table = report_data.get("missing_table")
-                            if missing_table is not None and not missing_table.empty:
-                                st.dataframe(missing_table.head(50), use_container_width=True, hide_index=True)
-                            else:
-                                st.success("No missing floodlight data detected!")
-                
-                else:
-                    # Placeholder when not running (matching friend's style)
-                    st.markdown("""
-                    <div class='anomaly-card'>
-                        <div style="font-size:18px; font-weight:700;">👆 Select an advertiser and click 'Analyze Data Anomalies'</div>
-                        <div style="margin-top:12px; color:rgba(255,255,255,0.75);">
-                            This tab analyzes Floodlight conversion data for anomalies:
-                        </div>
-                        <div style="margin-top:16px; display:grid; grid-template-columns: repeat(3, 1fr); gap:12px;">
-                            <div class='kpi-card'>
-                                <div style="font-size:20px;">📈</div>
-                                <div style="font-weight:700; margin-top:4px;">Spike Detection</div>
-                                <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Sudden surges in Floodlight impressions</div>
-                            </div>
-                            <div class='kpi-card'>
-                                <div style="font-size:20px;">❌</div>
-                                <div style="font-weight:700; margin-top:4px;">Missing Data</div>
-                                <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Floodlight activities that stopped firing</div>
-                            </div>
-                            <div class='kpi-card'>
-                                <div style="font-size:20px;">🤖</div>
-                                <div style="font-weight:700; margin-top:4px;">AI Insights</div>
-                                <div style="font-size:12px; color:rgba(255,255,255,0.65); margin-top:4px;">Root cause analysis via Groq LLM</div>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        except Exception as e:
-            st.error(f"Error loading anomaly detection: {e}")
-            st.info("Make sure the data files exist in data/anomalies/")
+        anomaly_dashboard()
 
 
 if __name__ == "__main__":